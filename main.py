@@ -1,4 +1,10 @@
+import sys
 from src.cellular_automaton import CellularAutomaton
 
 if __name__ == "__main__":
-    CellularAutomaton().run()
\ No newline at end of file
+    if '--serve' in sys.argv:
+        from src.server import serve
+        args = sys.argv[sys.argv.index('--serve') + 1:]
+        serve(port=int(args[0]) if args else 8000)
+    else:
+        CellularAutomaton().run()
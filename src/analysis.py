@@ -0,0 +1,112 @@
+import math, random
+from src.rules import RULE_TABLES
+from src.packed import pack_row, lane_masks, neighborhoods, step_packed
+
+CLASSES, LOCAL_SPREAD, CHAOTIC_SPREAD = ('I', 'II', 'III', 'IV'), 0.15, 0.5
+
+class Reducer:
+    def __init__(self, alpha=0.05):
+        self.alpha, self.value, self.change = alpha, None, 1.0
+
+    def push(self, sample):
+        if self.value is None:
+            self.value = sample
+        self.change = abs(sample - self.value)
+        self.value += self.alpha * (sample - self.value)
+
+class Density(Reducer):
+    def __init__(self, width, alpha=0.05):
+        super().__init__(alpha)
+        self.width = width
+
+    def update(self, alive):
+        self.push(alive / self.width)
+
+class BlockEntropy(Reducer):
+    def __init__(self, width, alpha=0.05):
+        super().__init__(alpha)
+        self.width = width
+
+    def update(self, counts):
+        self.push(-sum(count * math.log2(count / self.width) for count in counts if count) / (3 * self.width))
+
+class Damage(Reducer):
+    def __init__(self, width, alpha=0.05):
+        super().__init__(alpha)
+        self.width, self.generation, self.damaged, self.saturated = width, 0, [], False
+        self.half, self.lane = width // 2, (1 << width) - 1
+
+    def update(self, diffs):
+        self.generation += 1
+        self.damaged = [diff.bit_count() for diff in diffs]
+        extents = sorted(min(extent(diff), extent(rotate(diff, self.half, self.width, self.lane))) for diff in diffs)
+        self.saturated = extents[-1] >= self.width - 1
+        self.push((extents[(len(extents) - 1) // 2] + extents[len(extents) // 2]) / (4 * self.generation))
+
+    @property
+    def lyapunov(self):
+        alive = [math.log2(count) for count in self.damaged if count]
+        return sum(alive) / (len(self.damaged) * self.generation) if self.generation else 0.0
+
+class Cycle:
+    def __init__(self, width=None):
+        self.width, self.saved, self.power, self.length, self.period = width, None, 1, 0, None
+
+    def update(self, row):
+        if self.width:
+            row = format(row, f'0{self.width}b')
+            seen = self.saved is not None and row in self.saved
+        else:
+            seen = row == self.saved
+        if seen:
+            self.period = self.length
+        if self.power == self.length:
+            self.saved, self.power, self.length = row * 2 if self.width else row, self.power * 2, 0
+        self.length += 1
+
+def rotate(row, shift, width, lane):
+    shift %= width
+    return ((row << shift) | (row >> (width - shift))) & lane
+
+def extent(diff):
+    return diff.bit_length() - (diff & -diff).bit_length() + 1 if diff else 0
+
+def wolfram_class(uniform, period, spread):
+    if uniform:
+        return 'I'
+    if period is not None or spread < LOCAL_SPREAD:
+        return 'II'
+    return 'III' if spread >= CHAOTIC_SPREAD else 'IV'
+
+def classify_rule(rule_num, width=10**4, perturbations=4, max_steps=300, min_steps=32, tolerance=5e-3, seed=0, state=None):
+    if state is not None:
+        width = len(state)
+    table, lanes = RULE_TABLES[rule_num], perturbations + 1
+    masks, sites = lane_masks(width, lanes), [width * k // lanes for k in range(1, lanes)]
+    lane = (1 << width) - 1
+    original = pack_row(state) if state is not None else random.Random(seed).getrandbits(width)
+    rows = original
+    for k, site in enumerate(sites, 1):
+        rows |= (original ^ (1 << site)) << (k * width)
+    density, entropy, damage, cycle = Density(width), BlockEntropy(width), Damage(width), Cycle(width)
+    steps, uniform = 0, False
+    while steps < max_steps:
+        terms = neighborhoods(rows, width, masks)
+        rows = step_packed(rows, table, width, masks, terms)
+        steps += 1
+        row = rows & lane
+        density.update(row.bit_count())
+        entropy.update([(term & lane).bit_count() for term in terms])
+        damage.update([((rows >> (k * width)) ^ row) & lane for k in range(1, lanes)])
+        cycle.update(row)
+        uniform = row in (0, lane)
+        if uniform or cycle.period is not None or damage.saturated:
+            break
+        if steps >= min_steps and max(density.change, entropy.change, damage.change) < tolerance:
+            break
+    return {'rule': rule_num, 'wolfram_class': wolfram_class(uniform, cycle.period, damage.value),
+            'steps': steps, 'density': density.value, 'entropy': entropy.value, 'spread': damage.value,
+            'lyapunov': damage.lyapunov, 'period': cycle.period}
+
+def classify_rules(rules=range(256), **options):
+    return {rule_num: classify_rule(rule_num, **options) for rule_num in rules}
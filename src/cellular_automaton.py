@@ -1,37 +1,106 @@
-import os, time, threading, sys
-from src.rules import RULES
+import os, time, threading, sys, random
+from src.rules import rule_table
 from src.patterns import set_pattern
 from src.input_handler import handle_input
+from src.packed import pack_row, unpack_row
+from src.stochastic import UPDATES, bernoulli_bits, combine
 
 WIDTH, SPEED, ALIVE, DEAD = 60, 0.2, '■', '·'
+BOUNDARIES = ('periodic', 'fixed0', 'fixed1', 'reflective', 'open')
 
 class CellularAutomaton:
-    def __init__(self):
-        self.state, self.generation, self.running, self.rule_num = [0] * WIDTH, 0, False, 30
+    __slots__ = ('width', 'initial_width', 'pool', 'cells', 'spare', 'boundary', 'origin', 'update', 'probability', 'seed', 'rng',
+                 'generation', 'running', 'rule_num', 'history', 'max_history', 'listeners')
+
+    def __init__(self, width=WIDTH, pool=None, boundary='periodic', update='synchronous', probability=1.0, seed=None):
+        if boundary not in BOUNDARIES:
+            raise ValueError(f"Unknown boundary: {boundary}")
+        if update not in UPDATES:
+            raise ValueError(f"Unknown update: {update}")
+        if boundary == 'open' and update == 'probabilistic' and probability < 1:
+            raise ValueError("Open boundary cannot grow under probabilistic noise")
+        self.width, self.pool, self.cells, self.spare = width, pool, bytearray(width), bytearray(width)
+        self.boundary, self.origin, self.initial_width = boundary, 0, width
+        self.update, self.probability, self.seed, self.rng = update, probability, seed, None
+        self.generation, self.running, self.rule_num = 0, False, 30
         self.history, self.max_history = [], 25
+        self.listeners = []
+
+    @property
+    def state(self):
+        return self.cells
+
+    @state.setter
+    def state(self, cells):
+        if len(cells) != self.width:
+            self.width, self.spare = len(cells), bytearray(len(cells))
+            self.cells = bytearray(cells)
+        else:
+            self.cells[:] = cells
         
     def get_rule_table(self): 
-        return RULES.get(self.rule_num, RULES[30])
+        return rule_table(self.rule_num)
     
     def apply_rule(self, left, center, right): 
         pattern = (left << 2) + (center << 1) + right
         return self.get_rule_table()[pattern]
     
     def next_generation(self):
-        self.state = [(self.apply_rule(self.state[(i-1) % WIDTH], self.state[i], self.state[(i+1) % WIDTH])) for i in range(WIDTH)]
-        self.history.append(self.state[:])
-        if len(self.history) > self.max_history: 
-            self.history.pop(0)
+        boundary, state, last, table = self.boundary, self.cells, self.width - 1, self.get_rule_table()
+        if boundary == 'open' and table[0]:
+            raise ValueError(f"Open boundary needs a quiescent rule, rule {self.rule_num} maps 000 to 1")
+        if boundary == 'open' and (state[0] or state[last]):
+            self.grow(state[0], state[last])
+            state, last = self.cells, self.width - 1
+        nxt = self.spare
+        if boundary == 'periodic':
+            left, right = state[last], state[0]
+        elif boundary == 'reflective':
+            left, right = state[0], state[last]
+        else:
+            left = right = 1 if boundary == 'fixed1' else 0
+        for i in range(1, last):
+            nxt[i] = table[(state[i - 1] << 2) | (state[i] << 1) | state[i + 1]]
+        if last:
+            nxt[0] = table[(left << 2) | (state[0] << 1) | state[1]]
+            nxt[last] = table[(state[last - 1] << 2) | (state[last] << 1) | right]
+        else:
+            nxt[0] = table[(left << 2) | (state[0] << 1) | right]
+        if self.update != 'synchronous':
+            self.rng = self.rng or random.Random(self.seed)
+            mask = bernoulli_bits(self.rng, self.width, self.probability)
+            nxt[:] = unpack_row(combine(self.update, pack_row(nxt), pack_row(state), mask, (1 << self.width) - 1), self.width)
+        self.cells, self.spare = nxt, state
+        row = self.history.pop(0) if len(self.history) >= self.max_history else self.new_row()
+        row[:] = nxt
+        self.history.append(row)
         self.generation += 1
+        for listener in self.listeners:
+            listener(self)
     
+    def grow(self, left, right):
+        pad = max(1, self.width // 2)
+        cells = bytearray(pad if left else 0) + self.cells + bytearray(pad if right else 0)
+        self.width, self.cells, self.spare = len(cells), cells, bytearray(len(cells))
+        self.origin += pad if left else 0
+
+    def new_row(self):
+        return self.pool.acquire(self.width) if self.pool else bytearray(self.width)
+
+    def release(self):
+        if self.pool:
+            for row in self.history:
+                self.pool.release(row)
+        self.history = []
+
     def display(self):
-        screen = f"\033[2J\033[H┌{'─' * WIDTH}┐\n"
+        screen = f"\033[2J\033[H┌{'─' * self.width}┐\n"
         for i, hist_state in enumerate(self.history[-15:]):
             alpha = '90' if i < 10 else '37'
             row = "│" + ''.join(f'\033[{alpha}m{ALIVE}\033[0m' if cell else DEAD for cell in hist_state) + "│\n"
             screen += row
         screen += "│" + ''.join(f'\033[93m{ALIVE}\033[0m' if cell else DEAD for cell in self.state) + "│\n"
-        screen += f"└{'─' * WIDTH}┘\nGen: {self.generation:4d} | Rule: {self.rule_num:3d} | Speed: {1/SPEED:.1f}x | Cells: {sum(self.state):3d}\n"
+        screen += f"└{'─' * self.width}┘\nGen: {self.generation:4d} | Rule: {self.rule_num:3d} | Speed: {1/SPEED:.1f}x | Cells: {sum(self.state):3d}\n"
         screen += "[SPACE] Play/Pause | [R] Reset | [N] Next Rule | [P] Pattern | [Q] Quit"
         print(screen, end='', flush=True)
     
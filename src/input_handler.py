@@ -1,6 +1,9 @@
 import os, sys
 import threading
-import msvcrt
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
 import secrets
 from src.rules import RULES
 from src.patterns import set_pattern
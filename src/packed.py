@@ -0,0 +1,26 @@
+TO_DIGITS, FROM_DIGITS = bytes.maketrans(b'\x00\x01', b'01'), bytes.maketrans(b'01', b'\x00\x01')
+
+def pack_row(state):
+    return int(bytes(state).translate(TO_DIGITS)[::-1] or b'0', 2)
+
+def unpack_row(bits, width):
+    return bytearray(format(bits, f'0{width}b')[::-1].encode().translate(FROM_DIGITS))
+
+def lane_masks(width, lanes=1):
+    low = sum(1 << (lane * width) for lane in range(lanes))
+    return (1 << (width * lanes)) - 1, low, low << (width - 1)
+
+def neighborhoods(rows, width, masks):
+    full, low, high = masks
+    left = ((rows << 1) & (full ^ low)) | ((rows >> (width - 1)) & low)
+    right = ((rows >> 1) & (full ^ high)) | ((rows << (width - 1)) & high)
+    pairs = (full ^ (left | rows), (full ^ left) & rows, left & (full ^ rows), left & rows)
+    return [pair & side for pair in pairs for side in (full ^ right, right)]
+
+def step_packed(rows, table, width, masks, terms=None):
+    terms = terms or neighborhoods(rows, width, masks)
+    result = 0
+    for pattern, term in enumerate(terms):
+        if table[pattern]:
+            result |= term
+    return result
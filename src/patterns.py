@@ -1,15 +1,17 @@
-WIDTH = 60
-
 def set_pattern(self, pattern_name):
+    width = self.initial_width if self.boundary == 'open' else self.width
     patterns = {
-        'single': [(WIDTH//2, 1)], 
-        'double': [(WIDTH//2-1, 1), (WIDTH//2+1, 1)],
-        'triple': [(WIDTH//2-1, 1), (WIDTH//2, 1), (WIDTH//2+1, 1)],
-        'random': [(i, 1) for i in range(0, WIDTH, 3) if i % 7 == 0], 
-        'edges': [(5, 1), (WIDTH-6, 1)], 
-        'symmetric': [(WIDTH//2-10, 1), (WIDTH//2-5, 1), (WIDTH//2, 1), (WIDTH//2+5, 1), (WIDTH//2+10, 1)]
+        'single': [(width//2, 1)], 
+        'double': [(width//2-1, 1), (width//2+1, 1)],
+        'triple': [(width//2-1, 1), (width//2, 1), (width//2+1, 1)],
+        'random': [(i, 1) for i in range(0, width, 3) if i % 7 == 0], 
+        'edges': [(5, 1), (width-6, 1)], 
+        'symmetric': [(width//2-10, 1), (width//2-5, 1), (width//2, 1), (width//2+5, 1), (width//2+10, 1)]
     }
-    self.state = [0] * WIDTH
+    self.state = [0] * width
     for pos, val in patterns.get(pattern_name, []): 
-        if 0 <= pos < WIDTH: self.state[pos] = val
-    self.generation, self.history = 0, [self.state[:]]
+        if 0 <= pos < width: self.state[pos] = val
+    self.release()
+    row = self.new_row()
+    row[:] = self.state
+    self.generation, self.history, self.origin, self.rng = 0, [row], 0, None
@@ -0,0 +1,97 @@
+from src.rules import rule_table
+
+def transitions(rule_num):
+    table = rule_table(rule_num)
+    moves = ([[], [], [], []], [[], [], [], []])
+    for pair in range(4):
+        for cell in (0, 1):
+            moves[table[(pair << 1) | cell]][pair].append((cell, ((pair << 1) | cell) & 3))
+    return moves
+
+def retreat(moves):
+    return [bytes(sum(1 << pair for pair in range(4) if any(reach >> after & 1 for _, after in moves[target][pair]))
+                  for reach in range(16)) for target in (0, 1)]
+
+def count_preimages(row, rule_num):
+    moves, total = transitions(rule_num), 0
+    for start in range(4):
+        counts = [0] * 4
+        counts[start] = 1
+        for target in reversed(row):
+            counts = [sum(counts[after] for _, after in moves[target][pair]) for pair in range(4)]
+        total += counts[start]
+    return total
+
+def preimages(row, rule_num):
+    moves, width = transitions(rule_num), len(row)
+    back = retreat(moves)
+    for start in range(4):
+        reach = bytearray(width + 1)
+        reach[width] = 1 << start
+        for i in range(width - 1, -1, -1):
+            reach[i] = back[row[i]][reach[i + 1]]
+        if not reach[0] >> start & 1:
+            continue
+        cells, pending, i, pair = bytearray(width), [], 0, start
+        cells[0], cells[-1] = start & 1, start >> 1
+        while True:
+            if i == width:
+                yield bytearray(cells)
+                if not pending:
+                    break
+                i, cell, pair = pending.pop()
+            else:
+                options = [move for move in moves[row[i]][pair] if reach[i + 1] >> move[1] & 1]
+                if len(options) == 2:
+                    pending.append((i + 1, options[1][0], options[1][1]))
+                cell, pair = options[0]
+                i += 1
+            if i < width:
+                cells[i] = cell
+
+def advance(reach, moves):
+    following = []
+    for pairs in reach:
+        after = 0
+        for pair in range(4):
+            if pairs >> pair & 1:
+                for _, target in moves[pair]:
+                    after |= 1 << target
+        following.append(after)
+    return tuple(following)
+
+def closes(reach):
+    return any(pairs >> start & 1 for start, pairs in enumerate(reach))
+
+def is_garden_of_eden(row, rule_num):
+    moves, reach = transitions(rule_num), (1, 2, 4, 8)
+    for target in row:
+        reach = advance(reach, moves[target])
+        if not any(reach):
+            return True
+    return not closes(reach)
+
+def gardens_of_eden(width, rule_num):
+    moves, start = transitions(rule_num), (1, 2, 4, 8)
+    graph, frontier = {}, [start]
+    while frontier:
+        reach = frontier.pop()
+        if reach not in graph:
+            graph[reach] = (advance(reach, moves[0]), advance(reach, moves[1]))
+            frontier.extend(graph[reach])
+    orphan = [{reach for reach in graph if not closes(reach)}]
+    for _ in range(width):
+        orphan.append({reach for reach, following in graph.items() if following[0] in orphan[-1] or following[1] in orphan[-1]})
+    if start not in orphan[width]:
+        return
+    row, stack = bytearray(width), [(0, 0, start), (0, 1, start)]
+    while stack:
+        i, target, reach = stack.pop()
+        reach = graph[reach][target]
+        if reach not in orphan[width - i - 1]:
+            continue
+        row[i] = target
+        if i + 1 == width:
+            yield bytearray(row)
+        else:
+            stack.extend(((i + 1, 0, reach), (i + 1, 1, reach)))
@@ -3,4 +3,11 @@ RULES = {
     90: [0, 1, 0, 1, 1, 0, 1, 0],
     110: [0, 1, 1, 0, 1, 1, 1, 0],
     184: [0, 0, 0, 1, 0, 1, 1, 1]
-}
\ No newline at end of file
+}
+
+RULE_TABLES = tuple(tuple((rule_num >> pattern) & 1 for pattern in range(8)) for rule_num in range(256))
+
+def rule_table(rule_num):
+    if rule_num in RULES or not 0 <= rule_num < 256:
+        return RULES.get(rule_num, RULES[30])
+    return RULE_TABLES[rule_num]
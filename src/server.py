@@ -0,0 +1,168 @@
+import json, queue, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from src.cellular_automaton import CellularAutomaton, SPEED
+from src.input_handler import handle_key
+from src.patterns import set_pattern
+from src.packed import pack_row
+
+CONTROL_KEYS, QUEUE_SIZE, PING_INTERVAL = (' ', 'r', 'n', 'p'), 8, 15
+
+PAGE = """<!doctype html><meta charset="utf-8"><title>Automata</title>
+<body style="background:#111;color:#ddd;font-family:monospace">
+<pre id="rows"></pre><div id="info"></div>
+<button onclick="send(' ')">Play/Pause</button> <button onclick="send('r')">Reset</button>
+<button onclick="send('n')">Next Rule</button> <button onclick="send('p')">Pattern</button>
+<script>
+let row = 0n, lines = [];
+const send = k => fetch('/control?key=' + encodeURIComponent(k), {method: 'POST'});
+const draw = f => {
+  let line = '';
+  for (let i = 0; i < f.width; i++) line += (row >> BigInt(i)) & 1n ? '\\u25a0' : '\\u00b7';
+  lines = lines.concat(line).slice(-25);
+  document.getElementById('rows').textContent = lines.join('\\n');
+  document.getElementById('info').textContent = `Gen: ${f.generation} | Rule: ${f.rule}`;
+};
+const events = new EventSource('/events');
+events.addEventListener('key', e => { const f = JSON.parse(e.data); row = BigInt('0x' + f.bits); draw(f); });
+events.addEventListener('delta', e => { const f = JSON.parse(e.data); row ^= BigInt('0x' + f.bits); draw(f); });
+</script>"""
+
+def encode_frame(kind, ca, bits):
+    data = json.dumps({'generation': ca.generation, 'rule': ca.rule_num, 'width': len(ca.state), 'bits': format(bits, 'x')})
+    return f"event: {kind}\ndata: {data}\n\n".encode()
+
+class Viewer:
+    def __init__(self, size=QUEUE_SIZE):
+        self.frames, self.synced = queue.Queue(size), False
+
+class Broadcaster:
+    def __init__(self, ca, interval=SPEED):
+        self.ca, self.viewers, self.lock, self.last = ca, set(), threading.Lock(), None
+        self.interval, self.stepper, self.stopped, self.stepping = interval, None, threading.Event(), threading.Lock()
+        ca.listeners.append(self.publish)
+
+    def attach(self, size=QUEUE_SIZE):
+        viewer = Viewer(size)
+        with self.lock:
+            self.viewers.add(viewer)
+            if self.last is None:
+                self.last = pack_row(self.ca.state), len(self.ca.state)
+            viewer.frames.put_nowait(encode_frame('key', self.ca, self.last[0]))
+            viewer.synced = True
+        return viewer
+
+    def detach(self, viewer):
+        with self.lock:
+            self.viewers.discard(viewer)
+
+    def publish(self, ca):
+        with self.lock:
+            row = pack_row(ca.state)
+            key, delta = encode_frame('key', ca, row), None
+            if self.last is not None and self.last[1] == len(ca.state):
+                delta = encode_frame('delta', ca, row ^ self.last[0])
+            self.last = row, len(ca.state)
+            for viewer in self.viewers:
+                try:
+                    viewer.frames.put_nowait(delta if viewer.synced and delta else key)
+                    viewer.synced = True
+                except queue.Full:
+                    viewer.synced = False
+
+    def step(self):
+        while not self.stopped.is_set():
+            with self.stepping:
+                if self.ca.running:
+                    self.ca.next_generation()
+            time.sleep(self.interval)
+
+    def play(self):
+        self.ca.running = True
+        if self.stepper is None:
+            self.stepper = threading.Thread(target=self.step, daemon=True)
+            self.stepper.start()
+
+    def pause(self):
+        self.ca.running = False
+
+    def control(self, key):
+        if key not in CONTROL_KEYS:
+            return False
+        if key == ' ':
+            self.pause() if self.ca.running else self.play()
+        else:
+            with self.stepping:
+                handle_key(self.ca, key)
+                self.publish(self.ca)
+        return True
+
+class LiveViewHandler(BaseHTTPRequestHandler):
+    broadcaster = None
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/':
+            self.reply(200, PAGE.encode(), 'text/html; charset=utf-8')
+        elif path == '/events':
+            self.stream()
+        else:
+            self.reply(404, b'Not found')
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        key = parse_qs(url.query).get('key', [''])[0]
+        if url.path != '/control':
+            self.reply(404, b'Not found')
+        elif self.broadcaster.control(key):
+            self.reply(204)
+        else:
+            self.reply(400, b'Unknown key')
+
+    def reply(self, status, body=b'', content_type='text/plain; charset=utf-8'):
+        self.send_response(status)
+        if body:
+            self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        viewer = self.broadcaster.attach()
+        try:
+            while not self.broadcaster.stopped.is_set():
+                try:
+                    frame = viewer.frames.get(timeout=PING_INTERVAL)
+                except queue.Empty:
+                    frame = b': ping\n\n'
+                self.wfile.write(frame)
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.broadcaster.detach(viewer)
+
+    def log_message(self, format, *args):
+        pass
+
+def make_server(ca, host='127.0.0.1', port=8000, interval=SPEED):
+    handler = type('Handler', (LiveViewHandler,), {'broadcaster': Broadcaster(ca, interval)})
+    return ThreadingHTTPServer((host, port), handler)
+
+def serve(host='127.0.0.1', port=8000):
+    ca = CellularAutomaton()
+    set_pattern(ca, 'single')
+    server = make_server(ca, host, port)
+    server.RequestHandlerClass.broadcaster.play()
+    print(f"Sirviendo en http://{host}:{server.server_address[1]}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.RequestHandlerClass.broadcaster.pause()
+        server.RequestHandlerClass.broadcaster.stopped.set()
+        server.server_close()
+        print("\n\nSimulación terminada.")
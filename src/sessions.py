@@ -0,0 +1,125 @@
+import threading, time
+from collections import deque
+from src.cellular_automaton import CellularAutomaton, WIDTH
+from src.patterns import set_pattern
+
+class RowPool:
+    def __init__(self, limit=4096):
+        self.free, self.limit, self.reused, self.lock = {}, limit, 0, threading.Lock()
+
+    def acquire(self, width):
+        with self.lock:
+            rows = self.free.get(width)
+            if rows:
+                self.reused += 1
+                return rows.pop()
+        return bytearray(width)
+
+    def release(self, row):
+        with self.lock:
+            rows = self.free.setdefault(len(row), [])
+            if len(rows) < self.limit:
+                rows.append(row)
+
+class Session:
+    def __init__(self, session_id, ca):
+        self.id, self.ca, self.generations, self.busy = session_id, ca, 0, 0.0
+        self.active, self.closed = False, False
+
+    def step(self, generations=1):
+        start = time.perf_counter()
+        for _ in range(generations):
+            self.ca.next_generation()
+        self.busy += time.perf_counter() - start
+        self.generations += generations
+
+    def metrics(self):
+        rate = self.generations / self.busy if self.busy else 0.0
+        return {'rule': self.ca.rule_num, 'width': self.ca.width, 'generation': self.ca.generation,
+                'generations': self.generations, 'generations_per_second': rate,
+                'cells_per_second': rate * self.ca.width}
+
+class SessionManager:
+    def __init__(self, workers=1, quantum=1, pool=None):
+        self.workers, self.quantum, self.pool = workers, quantum, pool or RowPool()
+        self.sessions, self.ready, self.threads, self.next_id = {}, deque(), [], 0
+        self.generations, self.cells, self.started = 0, 0, time.perf_counter()
+        self.lock, self.stopped = threading.Lock(), threading.Event()
+
+    def create(self, rule_num=30, width=WIDTH, pattern='single'):
+        ca = CellularAutomaton(width, self.pool)
+        ca.rule_num = rule_num
+        set_pattern(ca, pattern)
+        with self.lock:
+            session = Session(self.next_id, ca)
+            self.sessions[session.id], self.next_id = session, self.next_id + 1
+            self.ready.append(session)
+        return session
+
+    def close(self, session_id):
+        with self.lock:
+            session = self.sessions.pop(session_id, None)
+            if session is None:
+                return
+            session.closed = True
+            idle = not session.active
+        if idle:
+            session.ca.release()
+
+    def acquire(self):
+        with self.lock:
+            while self.ready:
+                session = self.ready.popleft()
+                if not session.closed:
+                    session.active = True
+                    return session
+        return None
+
+    def finish(self, session):
+        with self.lock:
+            session.active = False
+            self.generations += self.quantum
+            self.cells += self.quantum * session.ca.width
+            if not session.closed:
+                self.ready.append(session)
+        if session.closed:
+            session.ca.release()
+
+    def step_round(self):
+        for _ in range(len(self.sessions)):
+            session = self.acquire()
+            if session is None:
+                break
+            session.step(self.quantum)
+            self.finish(session)
+
+    def work(self):
+        while not self.stopped.is_set():
+            session = self.acquire()
+            if session is None:
+                self.stopped.wait(0.01)
+                continue
+            session.step(self.quantum)
+            self.finish(session)
+
+    def start(self):
+        self.stopped.clear()
+        self.started = time.perf_counter()
+        self.threads = [threading.Thread(target=self.work, daemon=True) for _ in range(self.workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+
+    def metrics(self):
+        elapsed = time.perf_counter() - self.started
+        with self.lock:
+            sessions = {session_id: session.metrics() for session_id, session in self.sessions.items()}
+            generations, cells = self.generations, self.cells
+        return {'sessions': len(sessions), 'generations': generations, 'cells': cells,
+                'generations_per_second': generations / elapsed if elapsed else 0.0,
+                'cells_per_second': cells / elapsed if elapsed else 0.0, 'per_session': sessions}
@@ -0,0 +1,55 @@
+import random
+from src.rules import rule_table
+from src.packed import pack_row, unpack_row, lane_masks, step_packed
+
+UPDATES, PRECISION = ('synchronous', 'probabilistic', 'asynchronous'), 16
+
+def bernoulli_bits(rng, bits, probability, precision=PRECISION):
+    if probability >= 1:
+        return (1 << bits) - 1
+    quantized = round(max(probability, 0) * (1 << precision))
+    if not quantized:
+        return 0
+    if quantized >> precision:
+        return (1 << bits) - 1
+    while not quantized & 1:
+        quantized, precision = quantized >> 1, precision - 1
+    mask = 0
+    for _ in range(precision):
+        word = rng.getrandbits(bits)
+        mask = word | mask if quantized & 1 else word & mask
+        quantized >>= 1
+    return mask
+
+def combine(update, deterministic, current, mask, full):
+    if update == 'asynchronous':
+        return current ^ ((deterministic ^ current) & mask)
+    return deterministic ^ (full ^ mask)
+
+class Ensemble:
+    def __init__(self, rows, rule_num=30, update='asynchronous', probability=0.5, seeds=None):
+        if update not in UPDATES:
+            raise ValueError(f"Unknown update: {update}")
+        if seeds is not None and len(seeds) != len(rows):
+            raise ValueError(f"Expected {len(rows)} seeds, got {len(seeds)}")
+        self.width, self.lanes = len(rows[0]), len(rows)
+        self.rule_num, self.update, self.probability, self.generation = rule_num, update, probability, 0
+        self.masks, self.lane = lane_masks(self.width, self.lanes), (1 << self.width) - 1
+        self.rows = sum(pack_row(row) << (lane * self.width) for lane, row in enumerate(rows))
+        self.rngs = [random.Random(seed) for seed in (range(self.lanes) if seeds is None else seeds)]
+
+    def next_generation(self):
+        rows = step_packed(self.rows, rule_table(self.rule_num), self.width, self.masks)
+        if self.update != 'synchronous':
+            mask = 0
+            for lane, rng in enumerate(self.rngs):
+                mask |= bernoulli_bits(rng, self.width, self.probability) << (lane * self.width)
+            rows = combine(self.update, rows, self.rows, mask, self.masks[0])
+        self.rows = rows
+        self.generation += 1
+
+    def row(self, lane):
+        return unpack_row((self.rows >> (lane * self.width)) & self.lane, self.width)
+
+    def densities(self):
+        return [((self.rows >> (lane * self.width)) & self.lane).bit_count() / self.width for lane in range(self.lanes)]
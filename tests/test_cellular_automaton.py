@@ -701,5 +701,539 @@ class TestIntegration:
             # Verificar el mensaje de terminación
             mock_print.assert_any_call("\n\nSimulación terminada.")
 
+class TestServer:
+
+    def test_pack_row_roundtrip(self):
+        """Test empaquetado y desempaquetado de filas en bits"""
+        from src.packed import pack_row, unpack_row
+        state = [0, 1, 1, 0, 0, 0, 1]
+        assert pack_row(state) == 0b1000110
+        assert list(unpack_row(pack_row(state), 7)) == state
+
+    def test_publish_key_then_delta(self):
+        """Test el primer frame es completo y los siguientes son deltas"""
+        from src.server import Broadcaster
+        from src.packed import pack_row
+        ca = CellularAutomaton()
+        set_pattern(ca, 'single')
+        viewer = Broadcaster(ca).attach()
+        before = pack_row(ca.state)
+        ca.next_generation()
+        key, delta = viewer.frames.get_nowait(), viewer.frames.get_nowait()
+        assert key.startswith(b'event: key')
+        assert delta.startswith(b'event: delta')
+        bits = int(delta.split(b'"bits": "')[1].split(b'"')[0], 16)
+        assert before ^ bits == pack_row(ca.state)
+
+    def test_slow_viewer_drops_frames(self):
+        """Test un cliente lento pierde frames sin bloquear next_generation"""
+        from src.server import Broadcaster
+        ca = CellularAutomaton()
+        set_pattern(ca, 'single')
+        broadcaster = Broadcaster(ca)
+        slow, fast = broadcaster.attach(size=2), broadcaster.attach(size=50)
+        for _ in range(10):
+            ca.next_generation()
+        assert ca.generation == 10
+        assert slow.frames.qsize() == 2
+        assert fast.frames.qsize() == 11
+        assert slow.synced == False
+        slow.frames.get_nowait(), slow.frames.get_nowait()
+        ca.next_generation()
+        assert slow.frames.get_nowait().startswith(b'event: key')
+
+    def test_http_control_and_events(self):
+        """Test control por HTTP y flujo de eventos"""
+        import http.client
+        from src.server import make_server
+        ca = CellularAutomaton()
+        set_pattern(ca, 'single')
+        server = make_server(ca, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            port = server.server_address[1]
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('POST', '/control?key=n')
+            assert conn.getresponse().status == 204
+            assert ca.rule_num == 90
+            conn.request('POST', '/control?key=q')
+            assert conn.getresponse().status == 400
+            events = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            events.request('GET', '/events')
+            response = events.getresponse()
+            assert response.getheader('Content-Type') == 'text/event-stream'
+            assert response.readline().startswith(b'event: key')
+            events.close()
+        finally:
+            server.RequestHandlerClass.broadcaster.stopped.set()
+            server.shutdown()
+            server.server_close()
+
+    def test_http_play_streams_generations(self):
+        """Test Play/Pause por HTTP anima la simulación y emite deltas"""
+        import http.client
+        from src.server import make_server
+        ca = CellularAutomaton()
+        set_pattern(ca, 'single')
+        server = make_server(ca, port=0, interval=0.01)
+        broadcaster = server.RequestHandlerClass.broadcaster
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            port = server.server_address[1]
+            events = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            events.request('GET', '/events')
+            response = events.getresponse()
+            assert response.readline().startswith(b'event: key')
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            conn.request('POST', '/control?key=%20')
+            assert conn.getresponse().status == 204
+            assert ca.running == True
+            deltas = 0
+            while deltas < 3:
+                if response.readline().startswith(b'event: delta'):
+                    deltas += 1
+            assert ca.generation >= 3
+            conn.request('POST', '/control?key=%20')
+            assert conn.getresponse().status == 204
+            assert ca.running == False
+            time.sleep(0.05)
+            paused = ca.generation
+            time.sleep(0.1)
+            assert ca.generation == paused
+            events.close()
+        finally:
+            broadcaster.pause()
+            broadcaster.stopped.set()
+            server.shutdown()
+            server.server_close()
+
+    def test_control_waits_for_step(self):
+        """Test un control no se intercala con un paso en curso"""
+        from src.server import Broadcaster
+        ca = CellularAutomaton()
+        set_pattern(ca, 'single')
+        broadcaster = Broadcaster(ca)
+        with broadcaster.stepping:
+            control = threading.Thread(target=broadcaster.control, args=('n',))
+            control.start()
+            control.join(0.05)
+            assert control.is_alive()
+            assert ca.rule_num == 30
+        control.join(1)
+        assert ca.rule_num == 90
+
+
+class TestSessions:
+
+    def test_custom_width(self):
+        """Test autómata con ancho distinto al predeterminado"""
+        ca = CellularAutomaton(width=11)
+        set_pattern(ca, 'single')
+        ca.next_generation()
+        assert len(ca.state) == 11
+        assert list(ca.state[4:7]) == [1, 1, 1]
+
+    def test_rule_tables_shared(self):
+        """Test reglas fuera de RULES usan tablas compartidas"""
+        from src.rules import RULE_TABLES
+        ca1, ca2 = CellularAutomaton(), CellularAutomaton()
+        ca1.rule_num = ca2.rule_num = 45
+        assert ca1.get_rule_table() is ca2.get_rule_table() is RULE_TABLES[45]
+        assert list(RULE_TABLES[30]) == RULES[30]
+
+    def test_step_round_is_fair(self):
+        """Test cada sesión avanza lo mismo por ronda"""
+        from src.sessions import SessionManager
+        manager = SessionManager(quantum=2)
+        sessions = [manager.create(rule_num=rule, width=width) for rule, width in [(30, 60), (90, 31), (110, 100)]]
+        for _ in range(3):
+            manager.step_round()
+        assert [session.ca.generation for session in sessions] == [6, 6, 6]
+        metrics = manager.metrics()
+        assert metrics['sessions'] == 3
+        assert metrics['generations'] == 18
+        assert metrics['cells'] == 6 * (60 + 31 + 100)
+        assert metrics['per_session'][1]['width'] == 31
+
+    def test_closed_session_rows_are_reused(self):
+        """Test las filas de sesiones cerradas vuelven al pool"""
+        from src.sessions import SessionManager
+        manager = SessionManager()
+        first = manager.create(width=20)
+        for _ in range(30):
+            manager.step_round()
+        rows = list(first.ca.history)
+        manager.close(first.id)
+        second = manager.create(width=20)
+        assert manager.pool.reused == 1
+        manager.step_round()
+        assert manager.pool.reused == 2
+        assert all(any(row is reused for row in rows) for reused in second.ca.history)
+        manager.step_round()
+        assert first.ca.generation == 30
+
+    def test_close_is_idempotent(self):
+        """Test cerrar dos veces o un id desconocido no falla ni libera filas de más"""
+        from src.sessions import SessionManager
+        manager = SessionManager()
+        session = manager.create(width=20)
+        manager.close(session.id)
+        free = len(manager.pool.free[20])
+        manager.close(session.id)
+        manager.close(99)
+        assert len(manager.pool.free[20]) == free
+        assert manager.sessions == {}
+
+    def test_reset_returns_history_to_pool(self):
+        """Test reiniciar el patrón devuelve las filas del historial al pool"""
+        from src.sessions import SessionManager
+        manager = SessionManager()
+        session = manager.create(width=20)
+        for _ in range(30):
+            manager.step_round()
+        rows = list(session.ca.history)
+        set_pattern(session.ca, 'double')
+        assert len(session.ca.history) == 1
+        assert any(row is session.ca.history[0] for row in rows)
+        assert list(session.ca.history[0]) == list(session.ca.state)
+        assert len(manager.pool.free[20]) == len(rows) - 1
+
+    def test_workers_step_sessions(self):
+        """Test los workers avanzan las sesiones en segundo plano"""
+        from src.sessions import SessionManager
+        manager = SessionManager(workers=2)
+        sessions = [manager.create() for _ in range(10)]
+        manager.start()
+        time.sleep(0.1)
+        manager.stop()
+        assert all(session.ca.generation > 0 for session in sessions)
+        assert manager.metrics()['generations_per_second'] > 0
+
+class TestAnalysis:
+
+    def test_step_packed_matches_next_generation(self):
+        """Test el paso empaquetado coincide con next_generation para las 256 reglas"""
+        from src.packed import pack_row, lane_masks, step_packed
+        masks = lane_masks(60)
+        for rule_num in range(256):
+            ca = CellularAutomaton()
+            ca.rule_num = rule_num
+            set_pattern(ca, 'symmetric')
+            row = pack_row(ca.state)
+            for _ in range(5):
+                ca.next_generation()
+                row = step_packed(row, ca.get_rule_table(), 60, masks)
+            assert row == pack_row(ca.state)
+
+    def test_step_packed_lanes_are_independent(self):
+        """Test varias filas empaquetadas avanzan sin mezclarse"""
+        from src.packed import pack_row, lane_masks, step_packed
+        from src.rules import RULE_TABLES
+        ca = CellularAutomaton(width=16)
+        set_pattern(ca, 'edges')
+        row = pack_row(ca.state)
+        rows = step_packed(row | (row << 16), RULE_TABLES[30], 16, lane_masks(16, 2))
+        ca.next_generation()
+        assert rows == pack_row(ca.state) | (pack_row(ca.state) << 16)
+
+    def test_classify_known_rules(self):
+        """Test clasificación de reglas conocidas en clases de Wolfram"""
+        from src.analysis import classify_rules
+        result = classify_rules([0, 4, 14, 30, 90, 110, 184], width=2000)
+        assert {rule_num: info['wolfram_class'] for rule_num, info in result.items()} == {
+            0: 'I', 4: 'II', 14: 'II', 30: 'III', 90: 'III', 110: 'IV', 184: 'II'}
+
+    def test_classify_small_width_uses_ring_extent(self):
+        """Test el daño que da la vuelta al anillo no detiene la clasificación antes de tiempo"""
+        from src.analysis import classify_rules
+        result = classify_rules([30, 90, 110, 137], width=200)
+        assert {rule_num: info['wolfram_class'] for rule_num, info in result.items()} == {
+            30: 'III', 90: 'III', 110: 'IV', 137: 'IV'}
+        assert result[30]['steps'] > 60
+
+    def test_classify_stops_early(self):
+        """Test la clasificación termina antes al converger"""
+        from src.analysis import classify_rule
+        assert classify_rule(0, width=500)['steps'] == 1
+        assert classify_rule(4, width=500)['period'] == 1
+        assert classify_rule(30, width=2000, max_steps=300)['steps'] < 300
+
+    def test_classify_from_automaton_state(self):
+        """Test clasificación partiendo del estado de un autómata"""
+        from src.analysis import classify_rule
+        ca = CellularAutomaton(width=400)
+        set_pattern(ca, 'random')
+        assert classify_rule(8, width=400, state=ca.state)['wolfram_class'] == 'I'
+        assert classify_rule(30, state=ca.state) == classify_rule(30, width=400, state=ca.state)
+
+    def test_streaming_reducers(self):
+        """Test reductores incrementales de métricas"""
+        from src.analysis import Density, BlockEntropy, Cycle
+        density = Density(10)
+        for alive in (5, 5, 5):
+            density.update(alive)
+        assert density.value == 0.5
+        assert density.change == 0.0
+        entropy = BlockEntropy(8)
+        entropy.update([1] * 8)
+        assert entropy.value == 1.0
+        cycle = Cycle()
+        for row in (1, 2, 3, 2, 3, 2, 3):
+            cycle.update(row)
+        assert cycle.period == 2
+        cycle = Cycle(8)
+        for row in (0b00010011, 0b00100110, 0b01001100):
+            cycle.update(row)
+        assert cycle.period == 1
+
+class TestCompactState:
+
+    def test_state_is_compact(self):
+        """Test el estado usa bytearray y no tiene __dict__"""
+        ca = CellularAutomaton()
+        assert isinstance(ca.state, bytearray)
+        assert not hasattr(ca, '__dict__')
+        with pytest.raises(AttributeError):
+            ca.unknown = 1
+
+    def test_state_assignment_copies_into_buffer(self):
+        """Test asignar una lista al estado reutiliza el buffer"""
+        ca = CellularAutomaton()
+        buffer = ca.state
+        ca.state = [1] * 60
+        assert ca.state is buffer
+        assert sum(ca.state) == 60
+        ca.state = [1, 0, 1]
+        assert ca.width == 3
+        assert list(ca.state) == [1, 0, 1]
+
+    def test_buffers_are_swapped(self):
+        """Test next_generation alterna dos buffers preasignados"""
+        ca = CellularAutomaton()
+        set_pattern(ca, 'single')
+        first = ca.state
+        ca.next_generation()
+        second = ca.state
+        ca.next_generation()
+        assert second is not first
+        assert ca.state is first
+
+    def test_next_generation_allocates_nothing(self):
+        """Test next_generation no asigna memoria en régimen estable"""
+        import tracemalloc
+        ca = CellularAutomaton(width=300)
+        set_pattern(ca, 'single')
+        for _ in range(300):
+            ca.next_generation()
+        tracemalloc.start()
+        try:
+            for _ in range(10):
+                ca.next_generation()
+            before = tracemalloc.take_snapshot()
+            start, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            for _ in range(200):
+                ca.next_generation()
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+        finally:
+            tracemalloc.stop()
+        assert peak - start < ca.width
+        source = [tracemalloc.Filter(True, '*/src/*')]
+        growth = after.filter_traces(source).compare_to(before.filter_traces(source), 'lineno')
+        assert [stat for stat in growth if stat.size_diff or stat.count_diff] == []
+
+class TestBoundaries:
+
+    def test_unknown_boundary(self):
+        """Test frontera desconocida lanza ValueError"""
+        with pytest.raises(ValueError):
+            CellularAutomaton(boundary='mirror')
+
+    @pytest.mark.parametrize('boundary, expected', [
+        ('periodic', [1, 1, 0, 0, 0, 0, 0, 1]),
+        ('fixed0', [1, 1, 0, 0, 0, 0, 0, 0]),
+        ('fixed1', [0, 1, 0, 0, 0, 0, 0, 1]),
+        ('reflective', [0, 1, 0, 0, 0, 0, 0, 0]),
+    ])
+    def test_fixed_width_boundaries(self, boundary, expected):
+        """Test fronteras de ancho fijo con células en los bordes"""
+        ca = CellularAutomaton(width=8, boundary=boundary)
+        ca.state = [1, 0, 0, 0, 0, 0, 0, 0]
+        ca.next_generation()
+        assert list(ca.state) == expected
+
+    def test_single_cell_boundaries(self):
+        """Test fronteras con un autómata de una sola célula"""
+        ca = CellularAutomaton(width=1, boundary='fixed1')
+        ca.state = [0]
+        ca.next_generation()
+        assert list(ca.state) == [RULES[30][0b101]]
+
+    def test_open_boundary_grows_like_infinite_row(self):
+        """Test frontera abierta crece como una fila infinita"""
+        ca = CellularAutomaton(width=11, boundary='open')
+        set_pattern(ca, 'single')
+        ring = CellularAutomaton(width=401)
+        set_pattern(ring, 'single')
+        widths = {ca.width}
+        for _ in range(150):
+            ca.next_generation()
+            ring.next_generation()
+            widths.add(ca.width)
+            start = 200 - 5 - ca.origin
+            assert list(ring.state[start:start + ca.width]) == list(ca.state)
+        assert sorted(widths) == [11, 21, 41, 81, 161, 321]
+        assert ca.state[0] == 0 or ca.state[-1] == 0
+
+    def test_open_boundary_rejects_non_quiescent_rule(self):
+        """Test frontera abierta rechaza reglas que convierten 000 en 1"""
+        ca = CellularAutomaton(width=11, boundary='open')
+        ca.rule_num = 1
+        set_pattern(ca, 'single')
+        with pytest.raises(ValueError):
+            ca.next_generation()
+
+    def test_open_boundary_reset_restores_width(self):
+        """Test reiniciar un autómata abierto recupera el ancho y el origen"""
+        ca = CellularAutomaton(width=11, boundary='open')
+        set_pattern(ca, 'single')
+        for _ in range(40):
+            ca.next_generation()
+        assert ca.width > 11
+        set_pattern(ca, 'single')
+        assert ca.width == 11
+        assert ca.origin == 0
+        assert ca.state[5] == 1
+        assert sum(ca.state) == 1
+
+class TestPreimage:
+
+    def brute_force(self, row, rule_num):
+        from itertools import product
+        found = []
+        for cells in product((0, 1), repeat=len(row)):
+            ca = CellularAutomaton(width=len(row))
+            ca.rule_num, ca.state = rule_num, list(cells)
+            ca.next_generation()
+            if ca.state == bytearray(row):
+                found.append(bytes(cells))
+        return sorted(found)
+
+    @pytest.mark.parametrize('rule_num', [30, 90, 110, 184, 4, 204])
+    def test_preimages_match_brute_force(self, rule_num):
+        """Test preimágenes coinciden con la búsqueda exhaustiva"""
+        from src.preimage import preimages, count_preimages, is_garden_of_eden
+        for row in ([1, 0, 1, 1, 0, 0, 1], [0, 0, 0, 0, 0, 0], [1, 1, 0, 1, 0, 1, 1, 1]):
+            expected = self.brute_force(row, rule_num)
+            assert sorted(bytes(cells) for cells in preimages(row, rule_num)) == expected
+            assert count_preimages(row, rule_num) == len(expected)
+            assert is_garden_of_eden(row, rule_num) == (not expected)
+
+    def test_gardens_of_eden_match_brute_force(self):
+        """Test enumeración de jardines del Edén"""
+        from itertools import product
+        from src.preimage import gardens_of_eden
+        rows = [bytes(cells) for cells in product((0, 1), repeat=6)]
+        expected = sorted(row for row in rows if not self.brute_force(row, 184))
+        assert sorted(bytes(row) for row in gardens_of_eden(6, 184)) == expected
+        assert list(gardens_of_eden(6, 204)) == []
+
+    def test_preimages_are_lazy_at_large_width(self):
+        """Test preimágenes de filas grandes se generan bajo demanda"""
+        from src.preimage import preimages, count_preimages
+        ca = CellularAutomaton(width=10000)
+        set_pattern(ca, 'random')
+        ca.next_generation()
+        target = ca.state[:]
+        first = next(preimages(target, 30))
+        ca.state = first
+        ca.next_generation()
+        assert ca.state == target
+        assert count_preimages(target, 30) >= 1
+
+class TestStochastic:
+
+    def test_unknown_update(self):
+        """Test modo de actualización desconocido lanza ValueError"""
+        from src.stochastic import Ensemble
+        with pytest.raises(ValueError):
+            CellularAutomaton(update='random')
+        with pytest.raises(ValueError):
+            Ensemble([[0, 1, 0]], update='random')
+
+    def test_open_boundary_rejects_noise(self):
+        """Test frontera abierta con ruido probabilístico lanza ValueError"""
+        with pytest.raises(ValueError):
+            CellularAutomaton(boundary='open', update='probabilistic', probability=0.9)
+        CellularAutomaton(boundary='open', update='asynchronous', probability=0.9)
+
+    def test_ensemble_seed_count(self):
+        """Test el número de semillas debe coincidir con el de filas"""
+        from src.stochastic import Ensemble
+        with pytest.raises(ValueError):
+            Ensemble([[0, 1, 0], [1, 0, 0]], seeds=[1])
+
+    @pytest.mark.parametrize('probability', [0.0, 1e-7, 0.3, 0.5, 0.9, 0.999995, 1.0])
+    def test_bernoulli_bits_probability(self, probability):
+        """Test máscaras aleatorias en bloque con la probabilidad pedida"""
+        import random
+        from src.stochastic import bernoulli_bits
+        rng = random.Random(7)
+        ones = sum(bernoulli_bits(rng, 10000, probability).bit_count() for _ in range(5))
+        assert abs(ones / 50000 - probability) < 0.01
+
+    @pytest.mark.parametrize('update', ['probabilistic', 'asynchronous'])
+    def test_probability_one_is_deterministic(self, update):
+        """Test con probabilidad 1 el modo estocástico es determinista"""
+        ca, reference = CellularAutomaton(update=update, seed=3), CellularAutomaton()
+        set_pattern(ca, 'single')
+        set_pattern(reference, 'single')
+        for _ in range(20):
+            ca.next_generation()
+            reference.next_generation()
+        assert ca.state == reference.state
+
+    def test_asynchronous_zero_probability_freezes(self):
+        """Test asíncrono con probabilidad 0 no cambia el estado"""
+        ca = CellularAutomaton(update='asynchronous', probability=0.0)
+        set_pattern(ca, 'symmetric')
+        initial_state = ca.state[:]
+        ca.next_generation()
+        assert ca.state == initial_state
+
+    @pytest.mark.parametrize('update', ['probabilistic', 'asynchronous'])
+    def test_seed_is_reproducible(self, update):
+        """Test misma semilla produce la misma evolución"""
+        runs = []
+        for seed in (11, 11, 12):
+            ca = CellularAutomaton(update=update, probability=0.6, seed=seed)
+            set_pattern(ca, 'random')
+            for _ in range(30):
+                ca.next_generation()
+            runs.append(ca.state[:])
+            set_pattern(ca, 'random')
+            for _ in range(30):
+                ca.next_generation()
+            runs.append(ca.state[:])
+        assert runs[0] == runs[1] == runs[2] == runs[3]
+        assert runs[0] != runs[4]
+
+    @pytest.mark.parametrize('update', ['synchronous', 'probabilistic', 'asynchronous'])
+    def test_ensemble_matches_single_runs(self, update):
+        """Test el conjunto empaquetado reproduce cada ejecución individual"""
+        from src.stochastic import Ensemble
+        seeds = [5, 6, 7, 8]
+        runs = [CellularAutomaton(update=update, probability=0.7, seed=seed) for seed in seeds]
+        for ca in runs:
+            set_pattern(ca, 'triple')
+        ensemble = Ensemble([ca.state for ca in runs], update=update, probability=0.7, seeds=seeds)
+        for _ in range(40):
+            ensemble.next_generation()
+            for ca in runs:
+                ca.next_generation()
+        assert [ensemble.row(lane) for lane in range(4)] == [ca.state for ca in runs]
+        assert ensemble.densities() == [sum(ca.state) / 60 for ca in runs]
+
 if __name__ == '__main__':
     pytest.main(['-v'])